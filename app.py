@@ -1,20 +1,28 @@
 import pandas as pd 
+import polars as pl
+import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
 import dash
 from dash import Dash, dcc, html, Input, Output, State, ctx
 import dash_bootstrap_components as dbc
+from plotly_resampler import FigureResampler
 import glob
 import os
 import re
 from datetime import datetime
-
-# File utilities remain the same
-def get_latest_file(path_pattern):
-    files = glob.glob(path_pattern)
-    if not files:
-        raise FileNotFoundError(f"No files found for pattern: {path_pattern}")
-    return max(files, key=os.path.getmtime)
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+import threading
+
+# File utilities: filenames embed their timestamp, so the newest file is found without stat calls
+def get_latest_file(*path_patterns):
+    files = [f for pattern in path_patterns for f in glob.glob(pattern)]
+    stamped = [(extract_datetime_from_filename(f), f) for f in files]
+    stamped = [(ts, f) for ts, f in stamped if ts is not None]
+    if not stamped:
+        raise FileNotFoundError(f"No files found for pattern: {', '.join(path_patterns)}")
+    return max(stamped)[1]
 
 def extract_datetime_from_filename(filename):
     match = re.search(r'(\d{4}-\d{2}-\d{2}_\d{2}-\d{2}-\d{2})', filename)
@@ -22,18 +30,49 @@ def extract_datetime_from_filename(filename):
         return datetime.strptime(match.group(1), "%Y-%m-%d_%H-%M-%S")
     return None
 
+# Only the columns the dashboard uses are read. The historical series are held as float32
+# and the low-cardinality identifiers as categoricals; the realtime snapshot (~250 rows)
+# keeps full precision because the ticker totals are summed from it
+REALTIME_COLS = ['id', 'current_price', 'market_cap', 'total_volume', 'price_change_percentage_24h']
+HISTORICAL_COLS = ['id', 'timestamp', 'price', 'market_cap', 'total_volume', 'ath']
+HISTORICAL_FLOAT32_COLS = ['price', 'market_cap', 'total_volume', 'ath']
+CATEGORICAL_COLS = ['id']
+
+# Parquet is preferred; CSV is still read for snapshots written before the switch
+def read_data_file(path, columns, float32_cols=()):
+    dtypes = {c: pl.Float32 for c in float32_cols}
+    dtypes |= {c: pl.Categorical for c in columns if c in CATEGORICAL_COLS}
+    if path.endswith('.parquet'):
+        return pl.read_parquet(path, columns=columns).cast(dtypes)
+    # Timestamps are parsed by the CSV reader itself, no second pass over the column
+    date_cols = {'timestamp': pl.Datetime} if 'timestamp' in columns else {}
+    return pl.read_csv(path, columns=columns, schema_overrides=dtypes | date_cols)
+
 # Load files
-realtime_path = get_latest_file('data/realtime/crypto_data_*.csv')
-historical_path = get_latest_file('data/historical/top_10_crypto_*.csv')
+realtime_path = get_latest_file('data/realtime/crypto_data_*.parquet', 'data/realtime/crypto_data_*.csv')
+historical_path = get_latest_file('data/historical/top_10_crypto_*.parquet', 'data/historical/top_10_crypto_*.csv')
 
 realtime_time = extract_datetime_from_filename(realtime_path)
 historical_time = extract_datetime_from_filename(historical_path)
 last_updated = max(filter(None, [realtime_time, historical_time]))
 
-# Load CSVs
-realtime_df = pd.read_csv(realtime_path)
-historical_df = pd.read_csv(historical_path)
-historical_df['timestamp'] = pd.to_datetime(historical_df['timestamp'])
+# Load data with Polars; pandas copies are only kept for the Plotly boundary
+rt = read_data_file(realtime_path, REALTIME_COLS)
+hist = read_data_file(historical_path, HISTORICAL_COLS, HISTORICAL_FLOAT32_COLS)
+# Display order follows the file, i.e. the market-cap rank from top_10_coins.txt
+unique_ids = hist['id'].unique(maintain_order=True).cast(pl.String).to_list()
+# Sorted by (id, timestamp) so every coin occupies one contiguous, time-ordered row range
+hist = hist.sort(['id', 'timestamp'], maintain_order=True)
+realtime_df = rt.to_pandas()
+historical_df = hist.to_pandas()
+
+# Per-coin row ranges found from the id change points (compared as category codes);
+# slices are iloc views, no masks
+id_codes = historical_df['id'].cat.codes.to_numpy()
+coin_starts = np.flatnonzero(np.r_[True, id_codes[1:] != id_codes[:-1]])
+coin_ends = np.r_[coin_starts[1:], len(id_codes)]
+coin_bounds = {historical_df['id'].iat[lo]: (int(lo), int(hi)) for lo, hi in zip(coin_starts, coin_ends)}
+coin_groups = {cid: historical_df.iloc[lo:hi] for cid, (lo, hi) in coin_bounds.items()}
 
 # Initialize app
 app = Dash(__name__, external_stylesheets=[dbc.themes.CYBORG], suppress_callback_exceptions=True)
@@ -87,10 +126,12 @@ app.index_string = '''
 '''
 
 # KPIs
-total_market_cap = realtime_df['market_cap'].sum()
-total_volume = realtime_df['total_volume'].sum()
-btc_dominance = realtime_df[realtime_df['id'] == 'bitcoin']['market_cap'].values[0] / total_market_cap * 100
-btc_price = realtime_df[realtime_df['id'] == 'bitcoin']['current_price'].values[0]
+total_market_cap = rt['market_cap'].sum()
+total_volume = rt['total_volume'].sum()
+btc_i = int(np.flatnonzero(rt['id'].to_numpy() == 'bitcoin')[0])
+btc_mcap = float(rt['market_cap'][btc_i])
+btc_dominance = btc_mcap / total_market_cap * 100
+btc_price = float(rt['current_price'][btc_i])
 
 # Proper HTML Ticker
 kpi_cards = dbc.Card(
@@ -112,45 +153,85 @@ kpi_cards = dbc.Card(
 
 dropdown = dcc.Dropdown(
     id='crypto-select',
-    options=[{'label': coin, 'value': coin} for coin in historical_df['id'].unique()],
+    options=[{'label': coin, 'value': coin} for coin in unique_ids],
     value='bitcoin',
     clearable=False,
     style={'color': '#000'}
 )
 
-top10 = realtime_df.nlargest(10, 'market_cap')
+top10 = rt.top_k(10, by='market_cap')
 top10_sum = top10['market_cap'].sum()
 rest_sum = total_market_cap - top10_sum
 pie_data = pd.DataFrame({'category': ['Top 10 Coins', 'Other Coins'], 'market_cap': [top10_sum, rest_sum]})
 
-chart_items = [
-    ("Market Cap Distribution", px.histogram(realtime_df, x='market_cap', nbins=50, template='plotly_dark')),
-    ("Current Price Distribution", px.histogram(realtime_df, x='current_price', nbins=50, template='plotly_dark')),
-    ("Market Cap vs Volume", px.scatter(realtime_df, x='market_cap', y='total_volume', color='id', template='plotly_dark')),
-    ("Price Change % in 24h", px.histogram(realtime_df, x='price_change_percentage_24h', nbins=50, template='plotly_dark')),
-    ("Market Cap vs Price Change %", px.scatter(realtime_df, x='market_cap', y='price_change_percentage_24h', color='id', template='plotly_dark')),
-    ("Top 10 Most Traded", px.bar(realtime_df.nlargest(10, 'total_volume'), x='id', y='total_volume', template='plotly_dark')),
-    ("Top 10 vs Rest", px.pie(pie_data, names='category', values='market_cap', template='plotly_dark')),
+# BTC baselines for the "BTC vs Others" charts, computed once
+btc_hist = coin_groups['bitcoin']
+btc_mcap_mean = btc_hist['market_cap'].mean()
+btc_price_mean = btc_hist['price'].mean()
+others = historical_df[historical_df['id'] != 'bitcoin'].copy()
+others['mcap_pct_btc'] = others['market_cap'].to_numpy() / btc_mcap_mean * 100.0
+others['price_pct_btc'] = others['price'].to_numpy() / btc_price_mean * 100.0
+
+def build_corr_fig():
+    # Correlation of daily prices: pivot the Arrow-backed Polars frame (no pandas index
+    # machinery), then pairwise-complete Pearson from masked Gram matrices, so coins with
+    # a shorter history are only compared over the timestamps they share
+    price_wide = hist.pivot(on='id', index='timestamp', values='price', aggregate_function='mean').drop('timestamp')
+    corr_ids = price_wide.columns
+    wide = price_wide.to_numpy().astype(np.float32, copy=True)
+    # standardizing first keeps the float32 sums below well conditioned; it doesn't change r
+    wide -= np.nanmean(wide, axis=0)
+    wide /= np.nanstd(wide, axis=0)
+    valid = ~np.isnan(wide)
+    m = valid.astype(np.float32)
+    x = np.where(valid, wide, np.float32(0.0))
+    n = m.T @ m                      # rows where both coins have a price
+    sx = x.T @ m                     # sum of coin i over those rows
+    sxx = (x * x).T @ m              # sum of squares of coin i over those rows
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cov = x.T @ x - sx * sx.T / n
+        var = sxx - sx * sx / n
+        price_corr = cov / np.sqrt(var * var.T)
+    return px.imshow(price_corr, x=corr_ids, y=corr_ids, labels={'x': 'id', 'y': 'id'}, template='plotly_dark')
+
+def build_ath_fig():
+    # Latest price vs ATH per coin: the last row of each sorted coin range
+    ath_tail = historical_df[['id', 'price', 'ath']].iloc[coin_ends - 1]
+    ath_tail['current_vs_ath'] = ath_tail['price'].to_numpy() / ath_tail['ath'].to_numpy() * 100.0
+    return px.bar(ath_tail, x='id', y='current_vs_ath', template='plotly_dark')
+
+# Figures are only built when a slide is first shown; slides 7-9 are per-coin (see coin_figs)
+CHART_BUILDERS = [
+    ("Market Cap Distribution", lambda: px.histogram(realtime_df, x='market_cap', nbins=50, template='plotly_dark')),
+    ("Current Price Distribution", lambda: px.histogram(realtime_df, x='current_price', nbins=50, template='plotly_dark')),
+    ("Market Cap vs Volume", lambda: px.scatter(realtime_df, x='market_cap', y='total_volume', color='id', template='plotly_dark')),
+    ("Price Change % in 24h", lambda: px.histogram(realtime_df, x='price_change_percentage_24h', nbins=50, template='plotly_dark')),
+    ("Market Cap vs Price Change %", lambda: px.scatter(realtime_df, x='market_cap', y='price_change_percentage_24h', color='id', template='plotly_dark')),
+    ("Top 10 Most Traded", lambda: px.bar(realtime_df.nlargest(10, 'total_volume'), x='id', y='total_volume', template='plotly_dark')),
+    ("Top 10 vs Rest", lambda: px.pie(pie_data, names='category', values='market_cap', template='plotly_dark')),
     ("Price Over Time", None),
     ("Market Cap Over Time", None),
     ("Volume Over Time", None),
-    ("Market Cap vs Price", px.scatter(historical_df, x='price', y='market_cap', color='id', template='plotly_dark')),
-    ("Correlation Between Crypto Prices", px.imshow(historical_df.pivot_table(values='price', index='timestamp', columns='id').corr(), template='plotly_dark')),
-    ("How far are current price of coins from their ATH", px.bar(
-        historical_df.groupby('id').last().reset_index().assign(current_vs_ath=lambda df: df['price'] / df['ath'] * 100),
-        x='id', y='current_vs_ath', template='plotly_dark')),
-    ("Market Cap of BTC vs Other Cryptos", px.line(
-        historical_df[historical_df['id'] != 'bitcoin']
-        .assign(btc_market_cap=historical_df[historical_df['id'] == 'bitcoin']['market_cap'].mean())
-        .assign(mcap_pct_btc=lambda df: df['market_cap'] / df['btc_market_cap'] * 100),
-        x='timestamp', y='mcap_pct_btc', color='id', template='plotly_dark')),
-    ("Price of BTC vs Other Cryptos", px.line(
-        historical_df[historical_df['id'] != 'bitcoin']
-        .assign(btc_price=historical_df[historical_df['id'] == 'bitcoin']['price'].mean())
-        .assign(price_pct_btc=lambda df: df['price'] / df['btc_price'] * 100),
-        x='timestamp', y='price_pct_btc', color='id', template='plotly_dark')),
+    ("Market Cap vs Price", lambda: px.scatter(historical_df, x='price', y='market_cap', color='id', category_orders={'id': unique_ids}, template='plotly_dark')),
+    ("Correlation Between Crypto Prices", build_corr_fig),
+    ("How far are current price of coins from their ATH", build_ath_fig),
+    ("Market Cap of BTC vs Other Cryptos", lambda: px.line(
+        others, x='timestamp', y='mcap_pct_btc', color='id', category_orders={'id': unique_ids}, template='plotly_dark')),
+    ("Price of BTC vs Other Cryptos", lambda: px.line(
+        others, x='timestamp', y='price_pct_btc', color='id', category_orders={'id': unique_ids}, template='plotly_dark')),
 ]
 
+# Serialized once per slide, so later visits are a cache hit
+@lru_cache(maxsize=None)
+def get_fig(idx):
+    return CHART_BUILDERS[idx][1]().to_dict()
+
+# Builds every static figure in parallel to pre-fill the get_fig cache
+def warm_fig_cache():
+    static_idx = [i for i, (_, builder) in enumerate(CHART_BUILDERS) if builder is not None]
+    with ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1)) as ex:
+        list(ex.map(get_fig, static_idx))
+
 icon_list = ["📊", "💰", "🔄", "📈", "📉", "🔥", "🥧", "🕒", "🏛️", "🔊", "💹", "📊", "📏", "🔁", "⚖️"]
 
 nav_link_style = {
@@ -166,12 +247,12 @@ nav_link_style = {
 
 realtime_links = [
     dbc.NavLink(f"{icon_list[i]} {name}", href="#", id={'type': 'nav-link', 'index': f"rt-{i}"}, style=nav_link_style)
-    for i, (name, _) in enumerate(chart_items[:7])
+    for i, (name, _) in enumerate(CHART_BUILDERS[:7])
 ]
 
 historical_links = [
     dbc.NavLink(f"{icon_list[i+7]} {name}", href="#", id={'type': 'nav-link', 'index': f"his-{i}"}, style=nav_link_style)
-    for i, (name, _) in enumerate(chart_items[7:])
+    for i, (name, _) in enumerate(CHART_BUILDERS[7:])
 ]
 
 sidebar = html.Div([
@@ -229,6 +310,7 @@ app.layout = html.Div([
                 dbc.Col(dbc.Button("Next", id="next-btn", color="primary"), width="auto"),
             ], justify="center", className="mb-4 mt-3"),
             dcc.Store(id='slide-index', data=0),
+            dcc.Store(id='slide-index-debounced', data=0),
             dcc.Store(id='selected-coin', data='bitcoin'),
         ])
     ], id="main-content", style={"marginLeft": "270px", "padding": "20px", "transition": "margin-left 0.3s"}),
@@ -276,20 +358,28 @@ def adjust_layout(show_sidebar):
         toggle_style["left"] = "10px"
     return sidebar_style, content_style, toggle_style
 
-@app.callback(
+# Sidebar routing is a pure id -> index mapping, so it runs in the browser
+app.clientside_callback(
+    """
+    function(n_clicks_list) {
+        const triggered = window.dash_clientside.callback_context.triggered;
+        if (!triggered.length) {
+            return window.dash_clientside.no_update;
+        }
+        const propId = triggered[0].prop_id;
+        const fullIndex = JSON.parse(propId.slice(0, propId.lastIndexOf('.'))).index;
+        if (fullIndex.startsWith('rt-')) {
+            return parseInt(fullIndex.slice(3));
+        } else if (fullIndex.startsWith('his-')) {
+            return 7 + parseInt(fullIndex.slice(4));
+        }
+        return window.dash_clientside.no_update;
+    }
+    """,
     Output('slide-index', 'data'),
     Input({'type': 'nav-link', 'index': dash.ALL}, 'n_clicks'),
     prevent_initial_call=True
 )
-def set_slide(n_clicks_list):
-    triggered = ctx.triggered_id
-    if triggered and isinstance(triggered, dict):
-        full_index = triggered['index']
-        if full_index.startswith('rt-'):
-            return int(full_index.split('-')[1])
-        elif full_index.startswith('his-'):
-            return 7 + int(full_index.split('-')[1])
-    return dash.no_update
 
 @app.callback(
     Output('slide-index', 'data', allow_duplicate=True),
@@ -300,33 +390,67 @@ def set_slide(n_clicks_list):
 )
 def change_slide(prev_clicks, next_clicks, current_idx):
     if ctx.triggered_id == 'prev-btn':
-        return (current_idx - 1) % len(chart_items)
+        return (current_idx - 1) % len(CHART_BUILDERS)
     elif ctx.triggered_id == 'next-btn':
-        return (current_idx + 1) % len(chart_items)
+        return (current_idx + 1) % len(CHART_BUILDERS)
     return current_idx
 
+# Collapse bursts of Prev/Next/nav clicks: only the last index within 150 ms reaches the server
+app.clientside_callback(
+    """
+    function(idx) {
+        clearTimeout(window.cryptoDashSlideTimer);
+        window.cryptoDashSlideTimer = setTimeout(function() {
+            window.dash_clientside.set_props('slide-index-debounced', {data: idx});
+        }, 150);
+        return window.dash_clientside.no_update;
+    }
+    """,
+    Output('slide-index-debounced', 'data'),
+    Input('slide-index', 'data'),
+    prevent_initial_call=True
+)
+
 @app.callback(
     Output('question-title', 'children'),
     Output('main-graph', 'figure'),
     Output('dynamic-dropdown', 'children'),
-    Input('slide-index', 'data'),
+    Input('slide-index-debounced', 'data'),
     Input('selected-coin', 'data')
 )
 def update_slide(idx, coin):
-    question, fig = chart_items[idx]
+    question, _ = CHART_BUILDERS[idx]
     show_dropdown = idx in [7, 8, 9]
 
     if show_dropdown:
-        df = historical_df[historical_df['id'] == coin]
-        if idx == 7:
-            fig = px.line(df, x='timestamp', y='price', template='plotly_dark', title=f"{coin} Price Over Time")
-        elif idx == 8:
-            fig = px.line(df, x='timestamp', y='market_cap', template='plotly_dark', title=f"{coin} Market Cap Over Time")
-        elif idx == 9:
-            fig = px.line(df, x='timestamp', y='total_volume', template='plotly_dark', title=f"{coin} Volume Over Time")
+        fig = coin_figs(coin)[idx - 7]
+    else:
+        fig = get_fig(idx)
 
     return question, fig, dropdown if show_dropdown else None
 
+# Time-series slides ship LTTB-downsampled traces; the full series stays server-side for zooming
+@lru_cache(maxsize=64)
+def coin_figs(coin):
+    df = coin_groups[coin]
+    return (
+        FigureResampler(px.line(df, x='timestamp', y='price', template='plotly_dark', title=f"{coin} Price Over Time"), default_n_shown_samples=2000),
+        FigureResampler(px.line(df, x='timestamp', y='market_cap', template='plotly_dark', title=f"{coin} Market Cap Over Time"), default_n_shown_samples=2000),
+        FigureResampler(px.line(df, x='timestamp', y='total_volume', template='plotly_dark', title=f"{coin} Volume Over Time"), default_n_shown_samples=2000),
+    )
+
+@app.callback(
+    Output('main-graph', 'figure', allow_duplicate=True),
+    Input('main-graph', 'relayoutData'),
+    State('slide-index-debounced', 'data'),
+    State('selected-coin', 'data'),
+    prevent_initial_call=True
+)
+def resample_coin_fig(relayout_data, idx, coin):
+    if idx not in [7, 8, 9]:
+        return dash.no_update
+    return coin_figs(coin)[idx - 7].construct_update_data_patch(relayout_data)
+
 @app.callback(
     Output('selected-coin', 'data'),
     Input('crypto-select', 'value'),
@@ -339,6 +463,8 @@ if __name__ == '__main__':
     # for hosting on Render and similar services
     import os
     port = int(os.environ.get("PORT", 8050))
+    # warm figures in the background so the server starts accepting requests right away
+    threading.Thread(target=warm_fig_cache, daemon=True).start()
     app.run(host="0.0.0.0", port=port, debug=False)
 
 
@@ -9,10 +9,13 @@ import random
 # Define the correct directory for historical data
 historical_data_dir = "data/historical"
 
-# Function to delete old CSV files from the correct directory
-def delete_old_csv_files():
-    csv_pattern = os.path.join(historical_data_dir, 'top_10_crypto_365days_data_*.csv')
-    old_files = glob.glob(csv_pattern)
+# Also write the legacy CSV snapshot next to the Parquet file
+WRITE_CSV = False
+
+# Function to delete old data files (Parquet and legacy CSV) from the correct directory
+def delete_old_data_files():
+    old_files = (glob.glob(os.path.join(historical_data_dir, 'top_10_crypto_365days_data_*.parquet'))
+                 + glob.glob(os.path.join(historical_data_dir, 'top_10_crypto_365days_data_*.csv')))
     for file in old_files:
         try:
             os.remove(file)
@@ -20,7 +23,7 @@ def delete_old_csv_files():
         except Exception as e:
             print(f"⚠️ Error deleting {file}: {e}")
 
-delete_old_csv_files()  # Call function to delete old CSV files
+delete_old_data_files()  # Call function to delete old data files
 
 # Read top 10 coins dynamically from the file
 with open("data/historical/top_10_coins.txt", "r") as f:
@@ -137,8 +140,11 @@ merged_df = merged_df[column_order]  # Reorder columns
 if not os.path.exists(historical_data_dir):
     os.makedirs(historical_data_dir)
 
-# Save final dataset in the correct directory
+# Save final dataset in the correct directory (timestamps stay typed in Parquet)
 csv_filename = os.path.join(historical_data_dir, f'top_10_crypto_365days_data_{datetime.now().strftime("%Y-%m-%d_%H-%M-%S")}.csv')
-merged_df.to_csv(csv_filename, index=False)
+parquet_filename = csv_filename.replace('.csv', '.parquet')
+merged_df.to_parquet(parquet_filename, compression='snappy', index=False)
+if WRITE_CSV:
+    merged_df.to_csv(csv_filename, index=False)
 
-print(f"\n🎉 All data (historical + ATH + ATL) saved successfully to {csv_filename}!\n")
+print(f"\n🎉 All data (historical + ATH + ATL) saved successfully to {parquet_filename}!\n")
@@ -1,9 +1,11 @@
 import requests
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
 from datetime import datetime
 import time
 import os
-import glob
 
 # correct folder for realtime CSVs
 DATA_DIR = "data/realtime"
@@ -13,10 +15,16 @@ os.makedirs(DATA_DIR, exist_ok=True)
 TOP10_DIR = "data/historical"
 os.makedirs(TOP10_DIR, exist_ok=True)
 
-# Function to delete old CSV files
-def delete_old_csv_files():
-    csv_pattern = f"{DATA_DIR}/crypto_data_*.csv"
-    old_files = glob.glob(csv_pattern)
+# Also write a CSV copy of the snapshot next to the Parquet file. It is written by
+# pyarrow, so it has the same columns and values but not pandas' exact text format
+# (the header is quoted and floats print as e.g. 90191 or 5.0545650448e+10)
+WRITE_CSV = False
+
+# Function to delete old data files (Parquet and legacy CSV)
+def delete_old_data_files():
+    with os.scandir(DATA_DIR) as entries:
+        old_files = [e.path for e in entries
+                     if e.name.startswith('crypto_data_') and e.name.endswith(('.parquet', '.csv'))]
     for file in old_files:
         try:
             os.remove(file)
@@ -24,7 +32,7 @@ def delete_old_csv_files():
         except Exception as e:
             print(f"⚠️ Error deleting {file}: {e}")
 
-delete_old_csv_files()
+delete_old_data_files()
 
 # API information
 url = 'https://api.coingecko.com/api/v3/coins/markets'
@@ -47,18 +55,27 @@ if response.status_code == 200:
     df = df[['id', 'symbol', 'current_price', 'market_cap', 'total_volume', 
              'high_24h', 'low_24h', 'price_change_24h', 'price_change_percentage_24h', 'ath', 'atl']]
     
-    now = datetime.now()
-    df.loc[:, 'date'] = now.strftime('%Y-%m-%d')
-    df.loc[:, 'time'] = now.strftime('%H:%M:%S')
+    now = datetime.now().replace(microsecond=0)
+    df.loc[:, 'timestamp'] = pd.Timestamp(now)
 
-    column_order = ['id', 'symbol', 'date', 'time', 'current_price', 'market_cap', 'total_volume', 
+    column_order = ['id', 'symbol', 'timestamp', 'current_price', 'market_cap', 'total_volume', 
                     'high_24h', 'low_24h', 'price_change_24h', 'price_change_percentage_24h', 'ath', 'atl']
     df = df[column_order]
 
-    # SAVE MAIN REALTIME CSV
+    # SAVE MAIN REALTIME PARQUET (one Arrow table feeds both C++ writers)
     filename = f'crypto_data_{now.strftime("%Y-%m-%d_%H-%M-%S")}.csv'
-    df.to_csv(os.path.join(DATA_DIR, filename), index=False)
-    print(f"Data saved successfully as {filename}!")
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    pq.write_table(table, os.path.join(DATA_DIR, filename.replace('.csv', '.parquet')), compression='snappy')
+    if WRITE_CSV:
+        # unquoted values and whole-second timestamps like the pandas writer; quoting is only
+        # switched on if some value contains a delimiter, quote or newline
+        ts_i = table.schema.get_field_index('timestamp')
+        csv_table = table.set_column(ts_i, 'timestamp', table.column('timestamp').cast(pa.timestamp('s')))
+        try:
+            pacsv.write_csv(csv_table, os.path.join(DATA_DIR, filename), pacsv.WriteOptions(quoting_style='none'))
+        except pa.ArrowInvalid:
+            pacsv.write_csv(csv_table, os.path.join(DATA_DIR, filename), pacsv.WriteOptions(quoting_style='needed'))
+    print(f"Data saved successfully as {filename.replace('.csv', '.parquet')}!")
 
     # 🚀 NEW: Generate top_10_coins.txt
     top_10 = df.head(10)['id'].tolist()